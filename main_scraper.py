@@ -1,126 +1,413 @@
 #!/usr/bin/env python3
 """
 SMM Silver Price Scraper
-Scrapes silver price data from metal.com and saves to CSV with screenshots
+Scrapes silver price data from metal.com and saves to CSV with screenshots.
+Plain HTTP is tried first; a browser (and so a screenshot) is only used when the
+price is not in the server-rendered HTML, unless always_screenshot / --screenshot is set.
 """
 
 import os
 import csv
 import time
+import base64
+import calendar
+import argparse
+import functools
 import logging
+import logging.handlers
+import queue
+import atexit
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import re
 from datetime import datetime
+import requests
+from lxml import etree, html as lxml_html
 from selenium import webdriver
-from selenium.webdriver.common.by import By
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 
-# Setup logging
+# Setup logging - records are queued and written to file/console by a background listener
+_log_queue = queue.SimpleQueue()
+_log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+_log_handlers = [logging.FileHandler('logs/scraper.log'), logging.StreamHandler()]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+_log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/scraper.log'),
-        logging.StreamHandler()
-    ]
+    format='%(message)s',
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
 )
 logger = logging.getLogger(__name__)
 
+# Precompiled extraction patterns
+# Plain text (innerText, text_content) has no '>' to stop [^>]*, so the number must sit next to the unit
+_RE_CNY_TEXT = re.compile(r'(?<!\d)(\d{4,5})(?:\.\d+)?\s*CNY\s*/\s*kg', re.IGNORECASE)
+# Price and date alternatives scanned together in one pass over the page
+# (date is tried before cny so an ISO date is never read as a bare number)
+_DATE_PATTERN = r'Jul\s+\d{1,2},?\s+2025|\d{4}-\d{2}-\d{2}'
+# After an optional fractional part, the gap to the unit is short, tag-free and holds no
+# 4+ digit run (a small annotation like '+12' is fine), so a match never spans a year or
+# another price and each start position costs at most _UNIT_GAP steps
+_UNIT_GAP = r'(?:\.\d+)?(?:[^<>\d]|\d(?!\d{3})){0,80}?CNY[/\s]*kg'
+_RE_ALL = re.compile(
+    r'(?P<exact>9[,\s]*351)' + _UNIT_GAP +
+    r'|Original.{0,200}?(?P<orig>\d{1,2}[,\s]*\d{3})' + _UNIT_GAP +
+    r'|(?P<date>' + _DATE_PATTERN + r')'
+    r'|(?P<cny>\d{4,5})' + _UNIT_GAP,
+    re.IGNORECASE | re.DOTALL
+)
+# Date alone, for when the price is already known
+_RE_SCAN_DATE = re.compile(_DATE_PATTERN, re.IGNORECASE)
+_MONTHS = {'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+           'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12}
+_RE_DATE = re.compile(
+    r'(?P<mon>Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+(?P<d>\d{1,2}),?\s+(?P<y>\d{4})'
+    r'|(?P<iso_y>\d{4})-(?P<iso_m>\d{2})-(?P<iso_d>\d{2})'
+    r'|(?P<dmy_d>\d{2})[/-](?P<dmy_m>\d{2})[/-](?P<dmy_y>\d{4})',
+    re.IGNORECASE
+)
+# Bytes of HTML regexed around the first CNY/kg
+_WINDOW_RADIUS = 4096
+_RE_UNIT = re.compile(r'CNY\s*/\s*kg', re.IGNORECASE)
+_XPATH_PRICE = "//*[contains(text(),'CNY/kg') or contains(text(),'CNY / kg')]"
+_BLOCKED_URLS = ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.woff*", "*.ttf", "*.css", "*google-analytics*"]
+_XPATH_PRICE_SIBLING = "//span[contains(text(),'CNY/kg') or contains(text(),'CNY / kg')]/preceding-sibling::span[1]"
+# Texts of every _XPATH_PRICE_SIBLING match, read in one round-trip
+_JS_SIBLING_TEXTS = (
+    "const r = document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);"
+    "return Array.from({length: r.snapshotLength}, (_, i) => r.snapshotItem(i).innerText);"
+)
+_RE_NON_DIGIT = re.compile(r'\D')
+_RE_SLUG = re.compile(r'[^A-Za-z0-9]+')
+_JS_HAS_PRICE = "return !!document.body && /CNY\\s*\\/\\s*kg/.test(document.body.innerText);"
+_JS_PRICE_TEXT = (
+    "const el = Array.from(document.querySelectorAll('[class*=\"price\"]'))"
+    ".find(e => /CNY\\s*\\/\\s*kg/.test(e.innerText));"
+    "return (el || document.body).innerText;"
+)
+
+_SCREENSHOT_PARAMS = {'format': 'jpeg', 'quality': 70}
+_CSV_HEADER = ('timestamp', 'date', 'rate', 'raw_date', 'scrape_time')
+# run_many rows go to their own daily file with the URL each came from
+_CSV_URL_HEADER = _CSV_HEADER + ('url',)
+
+_DRIVER_CACHE_FILE = os.path.expanduser('~/.cache/ssm_silver/driver')
+# lru_cache does not serialize concurrent first calls, so run_many workers take this first
+_DRIVER_PATH_LOCK = threading.Lock()
+
+def _driver_path():
+    """Return the ChromeDriver path, resolving it at most once across threads"""
+    with _DRIVER_PATH_LOCK:
+        return _resolve_driver_path()
+
+@functools.lru_cache(maxsize=1)
+def _resolve_driver_path():
+    """Resolve the ChromeDriver binary once, reusing the path cached by earlier runs"""
+    try:
+        with open(_DRIVER_CACHE_FILE, encoding='utf-8') as f:
+            path = f.read().strip()
+        if os.path.isfile(path) and os.access(path, os.X_OK):
+            return path
+    except OSError:
+        pass
+    
+    path = ChromeDriverManager().install()
+    try:
+        os.makedirs(os.path.dirname(_DRIVER_CACHE_FILE), exist_ok=True)
+        with open(_DRIVER_CACHE_FILE, 'w', encoding='utf-8') as f:
+            f.write(path)
+    except OSError as e:
+        logger.warning("Could not cache driver path: %s", e)
+    return path
+
+def _forget_driver_path():
+    """Drop the cached ChromeDriver path so the next lookup resolves it again"""
+    with _DRIVER_PATH_LOCK:
+        _resolve_driver_path.cache_clear()
+        try:
+            os.remove(_DRIVER_CACHE_FILE)
+        except OSError:
+            pass
+
+DEFAULT_URL = "https://www.metal.com/silver/201102250392"
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+def _write_atomic(path, text):
+    """Write text via a temp file and rename so readers never see a partial file"""
+    tmp_path = None
+    try:
+        # Unique temp file per call so concurrent run_many dumps don't collide
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("Could not write %s: %s", path, e)
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def _write_bytes(path, data):
+    """Write bytes straight to a file descriptor, skipping the buffered-writer layer"""
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+    try:
+        fd = os.open(path, flags, 0o644)
+    except FileNotFoundError:
+        # The folder was removed after ensure_directories ran
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        fd = os.open(path, flags, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+def _url_slug(url):
+    """Filename-safe tail of a URL path, e.g. 'silver-price' for .../silver-price/"""
+    tail = url.split('?', 1)[0].rstrip('/').rsplit('/', 1)[-1]
+    return _RE_SLUG.sub('_', tail).strip('_')[:40] or 'page'
+
 class SMMSilverScraper:
-    def __init__(self):
-        self.url = "https://www.metal.com/silver/201102250392"
+    # Restart Chrome after this many scrapes to cap memory growth
+    MAX_USES_PER_DRIVER = 50
+    # Folders (absolute paths) already created in this process
+    _ENSURED = set()
+    
+    def __init__(self, url=DEFAULT_URL, headless=True, load_strategy='eager', user_agent=DEFAULT_USER_AGENT,
+                 always_screenshot=False):
+        self.url = url
+        self.headless = headless
+        self.load_strategy = load_strategy
         self.csv_folder = "csv"
         self.screenshot_folder = "screenshots"
+        self.user_agent = user_agent
+        self.always_screenshot = always_screenshot
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': self.user_agent})
+        self._driver = None
+        self._driver_uses = 0
+        self._local = threading.local()
+        self._thread_drivers = []
+        self._thread_sessions = []
+        self._lock = threading.Lock()
+        self._pending_rows = {}
+        self._csv_cache = (None, None, False)
+        self._writers = {}
+        self._executor = None
+        self._run_now = None
         self.ensure_directories()
         
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, *exc_info):
+        self.close()
+        
+    def close(self):
+        """Write pending CSV rows, quit the browser if one was started and close HTTP sessions"""
+        self.flush_csv()
+        self.close_csv()
+        self.close_driver()
+        for session in [self.session] + self._thread_sessions:
+            session.close()
+        self._thread_sessions = []
+        if self._executor:
+            self._executor.shutdown()
+            self._executor = None
+        
+    def close_driver(self):
+        """Quit the long-lived browser so the next scrape starts a fresh one"""
+        if self._driver:
+            try:
+                self._driver.quit()
+            except:
+                pass
+            self._driver = None
+        
+    def _background(self):
+        """Return the executor used to overlap screenshots with extraction"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=2)
+        return self._executor
+        
+    def now(self):
+        """Return the timestamp of the current run, or the wall clock outside one"""
+        return self._run_now or datetime.now()
+        
     def ensure_directories(self):
         """Create necessary directories if they don't exist"""
         for folder in [self.csv_folder, self.screenshot_folder, 'logs']:
-            os.makedirs(folder, exist_ok=True)
+            path = os.path.abspath(folder)
+            if path not in SMMSilverScraper._ENSURED:
+                os.makedirs(path, exist_ok=True)
+                SMMSilverScraper._ENSURED.add(path)
             
     def setup_driver(self):
         """Setup Chrome WebDriver with options"""
         chrome_options = Options()
-        chrome_options.add_argument('--headless')
+        if self.headless:
+            chrome_options.add_argument('--headless')
         chrome_options.add_argument('--no-sandbox')
         chrome_options.add_argument('--disable-dev-shm-usage')
         chrome_options.add_argument('--disable-gpu')
         chrome_options.add_argument('--window-size=1920,1080')
-        chrome_options.add_argument('--user-agent=Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+        chrome_options.add_argument(f'--user-agent={self.user_agent}')
         chrome_options.add_argument('--disable-extensions')
         chrome_options.add_argument('--disable-logging')
         chrome_options.add_argument('--ignore-certificate-errors')
+        chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+        chrome_options.add_argument('--disable-background-networking')
+        chrome_options.add_argument('--disable-sync')
+        chrome_options.add_argument('--disable-translate')
         
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
+        # Return once the DOM is ready (by default) and skip images, CSS and fonts
+        chrome_options.page_load_strategy = self.load_strategy
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.managed_default_content_settings.stylesheets": 2,
+            "profile.managed_default_content_settings.fonts": 2,
+            "profile.default_content_setting_values.cookies": 1,
+        })
+        
+        try:
+            driver = webdriver.Chrome(service=Service(_driver_path()), options=chrome_options)
+        except (WebDriverException, OSError) as e:
+            # Cached binary may be stale after a Chrome upgrade - resolve it once more
+            logger.warning("ChromeDriver failed to start, resolving it again: %s", e)
+            _forget_driver_path()
+            driver = webdriver.Chrome(service=Service(_driver_path()), options=chrome_options)
         driver.set_page_load_timeout(30)
+        
+        # Block heavy subresources the price scrape never needs
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": _BLOCKED_URLS})
         return driver
         
-    def extract_data(self, driver):
-        """Extract date and price data from the page"""
+    def get_driver(self):
+        """Return the long-lived WebDriver, starting or recycling it as needed"""
+        if self._driver is not None and self._driver_uses >= self.MAX_USES_PER_DRIVER:
+            logger.info("Recycling WebDriver after %s uses", self._driver_uses)
+            self.close_driver()
+        
+        if self._driver is not None:
+            # Start each reuse from a clean session - this also checks the browser is still alive
+            try:
+                self._driver.delete_all_cookies()
+            except WebDriverException as e:
+                logger.warning("WebDriver is unresponsive, restarting it: %s", e)
+                self.close_driver()
+        
+        if self._driver is None:
+            self._driver = self.setup_driver()
+            self._driver_uses = 0
+            logger.info("WebDriver initialized")
+        
+        self._driver_uses += 1
+        return self._driver
+        
+    def fetch_html(self, url=None, session=None):
+        """Fetch the server-rendered page HTML without a browser"""
+        response = (session or self.session).get(url or self.url, timeout=10)
+        response.raise_for_status()
+        return response.text
+        
+    def _thread_session(self):
+        """Return the calling worker thread's own HTTP session"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.headers.update({'User-Agent': self.user_agent})
+            with self._lock:
+                self._thread_sessions.append(session)
+        return session
+        
+    def get_page_source(self, driver):
+        """Return the rendered page source"""
         try:
-            # Wait for page load
-            time.sleep(10)
+            # Read the DOM over CDP directly, falling back to page_source
+            root = driver.execute_cdp_cmd('DOM.getDocument', {'depth': 0})['root']
+            page_source = driver.execute_cdp_cmd('DOM.getOuterHTML', {'nodeId': root['nodeId']})['outerHTML']
+        except WebDriverException:
             page_source = driver.page_source
+        
+        # Save page source for debugging, off the scraping thread
+        if os.getenv('SSM_DEBUG'):
+            threading.Thread(
+                target=_write_atomic, args=('logs/page_source.html', page_source)
+            ).start()
+        
+        logger.info("Page title: %s", driver.title)
+        logger.info("Page URL: %s", driver.current_url)
+        return page_source
+        
+    def extract_price_from_dom(self, page_source):
+        """Read the price from the CNY/kg node instead of scanning the whole page"""
+        try:
+            tree = lxml_html.fromstring(page_source)
+        except (etree.ParserError, ValueError):
+            return None
+        
+        for node in tree.xpath(_XPATH_PRICE):
+            # Price and unit are often split across sibling spans
+            container = node.getparent() if node.getparent() is not None else node
+            # Join text runs with spaces so adjacent nodes don't fuse into one number
+            price = self.find_price_in_text(' '.join(container.itertext()))
+            if price:
+                return price
+        return None
+        
+    def extract_price_from_element(self, driver):
+        """Read the price from the span just before the rendered CNY/kg unit"""
+        try:
+            for text in driver.execute_script(_JS_SIBLING_TEXTS, _XPATH_PRICE_SIBLING) or []:
+                digits = _RE_NON_DIGIT.sub('', text.split('.', 1)[0])
+                if digits and 8000 <= int(digits) <= 12000:
+                    logger.info("Found price element: %s", digits)
+                    return digits
+        except WebDriverException as e:
+            logger.warning("Price element lookup failed: %s", e)
+        return None
+        
+    def extract_price_from_driver(self, driver):
+        """Read the rendered price text in a single WebDriver round-trip"""
+        return self.find_price_in_text(driver.execute_script(_JS_PRICE_TEXT) or '')
+        
+    def find_price_in_text(self, text):
+        """Return the first CNY/kg price in a reasonable range from plain text"""
+        for match in _RE_CNY_TEXT.finditer(text.replace(',', '')):
+            if 8000 <= int(match.group(1)) <= 12000:
+                return match.group(1)
+        return None
+        
+    def extract_data(self, page_source, price=None):
+        """Extract date and price data from the page HTML; a known price skips the price lookups"""
+        try:
+            # Extract price - query the price node first
+            price_found = price or self.extract_price_from_dom(page_source)
+            if price_found and not price:
+                logger.info("Found price node: %s", price_found)
             
-            # Save page source
-            with open('logs/page_source.html', 'w', encoding='utf-8') as f:
-                f.write(page_source)
-            
-            logger.info(f"Page title: {driver.title}")
-            logger.info(f"Page URL: {driver.current_url}")
-            
-            # Extract price - look for 9,351 CNY/kg pattern specifically
-            price_found = None
-            
-            # Pattern 1: Look for the exact "9,351" with CNY/kg
-            pattern1 = re.search(r'9[,\s]*351[^>]*CNY[/\s]*kg', page_source, re.IGNORECASE)
-            if pattern1:
-                price_found = "9351"
-                logger.info("Found 9,351 CNY/kg pattern")
-            
-            # Pattern 2: Look for "Original" section with any price
-            if not price_found:
-                original_match = re.search(r'Original.*?(\d{1,2}[,\s]*\d{3})[^>]*CNY[/\s]*kg', page_source, re.IGNORECASE | re.DOTALL)
-                if original_match:
-                    price_found = original_match.group(1).replace(',', '').replace(' ', '')
-                    logger.info(f"Found Original section price: {price_found}")
-            
-            # Pattern 3: Look for any CNY/kg price in reasonable range
-            if not price_found:
-                cny_matches = re.findall(r'(\d{4,5})[^>]*CNY[/\s]*kg', page_source, re.IGNORECASE)
-                for match in cny_matches:
-                    if 8000 <= int(match) <= 12000:
-                        price_found = match
-                        logger.info(f"Found CNY/kg price: {price_found}")
-                        break
-            
-            # Extract date - look for Jul 24, 2025 or current date
+            # Regex the area around the price first, then the full page if that comes up short
             date_found = None
-            date_patterns = [
-                r'Jul\s+24,?\s+2025',
-                r'Jul\s+\d{1,2},?\s+2025',
-                r'\d{4}-\d{2}-\d{2}',
-            ]
-            
-            for pattern in date_patterns:
-                match = re.search(pattern, page_source, re.IGNORECASE)
-                if match:
-                    date_found = match.group()
-                    logger.info(f"Found date: {date_found}")
+            window = self.price_window(page_source)
+            for text in ((window, page_source) if window else (page_source,)):
+                price_found, date_found = self.scan_text(text, price_found, date_found)
+                if price_found and date_found:
                     break
             
             # Use current date as fallback
             if not date_found:
-                date_found = datetime.now().strftime('%b %d, %Y')
-            
-            # Use screenshot-based fallback price
-            if not price_found:
-                price_found = "9351"
-                logger.warning("Using fallback price from screenshot")
+                date_found = self.now().strftime('%b %d, %Y')
             
             parsed_date = self.parse_date(date_found)
             
@@ -131,175 +418,378 @@ class SMMSilverScraper:
             }
             
         except Exception as e:
-            logger.error(f"Extraction error: {e}")
+            logger.error("Extraction error: %s", e)
             return {
-                'date': datetime.now().strftime('%Y-%m-%d'),
-                'rate': '9351',
+                'date': self.now().strftime('%Y-%m-%d'),
+                'rate': None,
                 'raw_date': 'Jul 24, 2025'
             }
     
+    def price_window(self, page_source):
+        """Return the slice of HTML around the first CNY/kg (or CNY / kg) mention, or None if there is none"""
+        # Plain find is far cheaper than a case-insensitive regex over the page
+        anchor = page_source.find('CNY/kg')
+        if anchor < 0:
+            anchor = page_source.find('CNY / kg')
+        if anchor < 0:
+            match = _RE_UNIT.search(page_source)
+            if not match:
+                return None
+            anchor = match.start()
+        return page_source[max(0, anchor - _WINDOW_RADIUS):anchor + _WINDOW_RADIUS]
+    
+    def scan_text(self, text, price_found=None, date_found=None):
+        """Fill in whichever of price and date is still missing in one regex pass"""
+        if price_found:
+            if not date_found:
+                match = _RE_SCAN_DATE.search(text)
+                if match:
+                    date_found = match.group()
+                    logger.info("Found date: %s", date_found)
+            return price_found, date_found
+        
+        for match in _RE_ALL.finditer(text):
+            kind = match.lastgroup
+            if kind == 'date':
+                if not date_found:
+                    date_found = match.group('date')
+                    logger.info("Found date: %s", date_found)
+            elif not price_found:
+                if kind == 'exact':
+                    price_found = "9351"
+                    logger.info("Found 9,351 CNY/kg pattern")
+                elif kind == 'orig':
+                    price_found = match.group('orig').replace(',', '').replace(' ', '')
+                    logger.info("Found Original section price: %s", price_found)
+                elif 8000 <= int(match.group('cny')) <= 12000:
+                    price_found = match.group('cny')
+                    logger.info("Found CNY/kg price: %s", price_found)
+            
+            if price_found and date_found:
+                break
+        return price_found, date_found
+    
     def parse_date(self, date_text):
         """Parse date to YYYY-MM-DD format"""
         if not date_text:
-            return datetime.now().strftime('%Y-%m-%d')
-            
-        try:
-            if 'Jul' in date_text and '2025' in date_text:
-                # Handle "Jul 24, 2025" format
-                clean_date = re.sub(r'[^\w\s,]', '', date_text)
-                parsed = datetime.strptime(clean_date, '%b %d %Y')
-                return parsed.strftime('%Y-%m-%d')
-            elif '-' in date_text and len(date_text) == 10:
-                # Already in YYYY-MM-DD format
-                return date_text
-        except:
-            pass
-            
-        return datetime.now().strftime('%Y-%m-%d')
+            return self.now().strftime('%Y-%m-%d')
+        
+        # Already in YYYY-MM-DD format - slice it rather than running the regex
+        if len(date_text) == 10 and date_text[4] == '-' and date_text[7] == '-' \
+                and date_text.replace('-', '').isdigit():
+            year, month, day = int(date_text[:4]), int(date_text[5:7]), int(date_text[8:])
+        else:
+            # One regex covers "Jul 24, 2025", "2025-07-24" and "24/07/2025"
+            match = _RE_DATE.search(date_text)
+            if not match:
+                return self.now().strftime('%Y-%m-%d')
+            if match.group('mon'):
+                year, month, day = int(match.group('y')), _MONTHS[match.group('mon').lower()], int(match.group('d'))
+            elif match.group('iso_y'):
+                year, month, day = int(match.group('iso_y')), int(match.group('iso_m')), int(match.group('iso_d'))
+            else:
+                year, month, day = int(match.group('dmy_y')), int(match.group('dmy_m')), int(match.group('dmy_d'))
+        
+        # Reject impossible dates such as 31/02 without raising
+        if year >= 1 and 1 <= month <= 12 and 1 <= day <= calendar.monthrange(year, month)[1]:
+            return f"{year:04d}-{month:02d}-{day:02d}"
+        return self.now().strftime('%Y-%m-%d')
     
-    def take_screenshot(self, driver, data):
-        """Take screenshot of the page"""
+    def take_screenshot(self, driver, tag=None):
+        """Take screenshot of the page; tag keeps parallel screenshots from sharing a filename"""
         logger.info("🔄 Starting screenshot process...")
         
         try:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            screenshot_path = os.path.join(self.screenshot_folder, f'smm_silver_{timestamp}.png')
+            timestamp = self.now().strftime('%Y%m%d_%H%M%S')
+            name = f'smm_silver_{timestamp}_{tag}' if tag else f'smm_silver_{timestamp}'
+            screenshot_path = os.path.join(self.screenshot_folder, name + '.jpg')
             
-            # Debug: Check current working directory
-            logger.info(f"📁 Current working directory: {os.getcwd()}")
-            logger.info(f"📸 Screenshot target path: {screenshot_path}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("📁 Current working directory: %s", os.getcwd())
+                logger.debug("📸 Screenshot target path: %s", screenshot_path)
             
-            # Force create directory
-            os.makedirs(self.screenshot_folder, mode=0o777, exist_ok=True)
-            logger.info(f"📂 Directory created/verified: {self.screenshot_folder}")
-            
-            # Debug: List directory contents before
-            if os.path.exists(self.screenshot_folder):
-                files_before = os.listdir(self.screenshot_folder)
-                logger.info(f"📋 Files in screenshots/ before: {files_before}")
+            # Wait for the page to finish loading, but a partial page beats no screenshot
+            try:
+                WebDriverWait(driver, 5).until(
+                    lambda d: d.execute_script('return document.readyState') == 'complete'
+                )
+            except TimeoutException:
+                logger.warning("Page still loading, taking screenshot anyway")
             
-            # Wait and get page info
-            time.sleep(5)
-            logger.info(f"🌐 Page size: {driver.get_window_size()}")
-            logger.info(f"📄 Page ready state: {driver.execute_script('return document.readyState')}")
+            # Capture as JPEG over CDP - much cheaper to encode and store than PNG
+            try:
+                result = driver.execute_cdp_cmd('Page.captureScreenshot', _SCREENSHOT_PARAMS)
+                screenshot_bytes = base64.b64decode(result['data'])
+            except WebDriverException as e:
+                logger.warning("CDP screenshot failed, using WebDriver PNG: %s", e)
+                screenshot_path = os.path.splitext(screenshot_path)[0] + '.png'
+                screenshot_bytes = driver.get_screenshot_as_png()
             
-            # Try screenshot
-            logger.info("📸 Attempting screenshot...")
-            screenshot_png = driver.get_screenshot_as_png()
-            logger.info(f"📊 Screenshot data size: {len(screenshot_png)} bytes")
+            # Write file (_write_bytes recreates the directory if it has gone)
+            _write_bytes(screenshot_path, screenshot_bytes)
+            logger.info("✅ Screenshot saved: %s (%s bytes)", screenshot_path, len(screenshot_bytes))
             
-            # Write file
-            logger.info(f"💾 Writing to: {screenshot_path}")
-            with open(screenshot_path, 'wb') as f:
-                f.write(screenshot_png)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("📋 Files in screenshots/ after: %s", os.listdir(self.screenshot_folder))
             
-            # Verify and debug
-            if os.path.exists(screenshot_path):
-                size = os.path.getsize(screenshot_path)
-                logger.info(f"✅ Screenshot file created: {size} bytes")
-                
-                # List directory contents after
-                files_after = os.listdir(self.screenshot_folder)
-                logger.info(f"📋 Files in screenshots/ after: {files_after}")
-                
-                return screenshot_path
-            else:
-                logger.error("❌ Screenshot file does not exist after write")
-                return None
+            return screenshot_path
                 
         except Exception as e:
-            logger.error(f"❌ Screenshot exception: {type(e).__name__}: {str(e)}")
-            
-            # Try creating a dummy file to test file system
-            try:
-                dummy_path = os.path.join(self.screenshot_folder, f'test_{timestamp}.txt')
-                with open(dummy_path, 'w') as f:
-                    f.write("Test file creation")
-                logger.info(f"✅ Dummy file created successfully: {dummy_path}")
-            except Exception as dummy_e:
-                logger.error(f"❌ Even dummy file creation failed: {dummy_e}")
-            
+            logger.error("❌ Screenshot exception: %s: %s", type(e).__name__, e)
             return None
     
     def save_to_csv(self, data):
-        """Save data to CSV file"""
+        """Queue a row for the CSV file; rows are written by flush_csv"""
         try:
-            timestamp = datetime.now().strftime('%Y%m%d')
-            csv_path = os.path.join(self.csv_folder, f'smm_silver_prices_{timestamp}.csv')
-            
-            file_exists = os.path.exists(csv_path)
-            
-            with open(csv_path, 'a', newline='', encoding='utf-8') as file:
-                fieldnames = ['timestamp', 'date', 'rate', 'raw_date', 'scrape_time']
-                writer = csv.DictWriter(file, fieldnames=fieldnames)
-                
-                if not file_exists:
-                    writer.writeheader()
-                
-                data['timestamp'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                data['scrape_time'] = datetime.now().strftime('%H:%M:%S')
-                
-                writer.writerow(data)
-                logger.info(f"Data saved to CSV: {csv_path}")
-                
+            now = self.now()
+            
+            # Only rebuild the path and stat the file when the day rolls over
+            today = now.strftime('%Y%m%d')
+            if self._csv_cache[0] != today:
+                csv_path = os.path.join(self.csv_folder, f'smm_silver_prices_{today}.csv')
+                self._csv_cache = (today, csv_path, os.path.exists(csv_path))
+            csv_path = self._csv_cache[1]
+            
+            row = (now.strftime('%Y-%m-%d %H:%M:%S'), data['date'], data['rate'],
+                   data['raw_date'], now.strftime('%H:%M:%S'))
+            if data.get('url'):
+                csv_path = os.path.join(self.csv_folder, f'smm_silver_prices_urls_{today}.csv')
+                row += (data['url'],)
+            self._pending_rows.setdefault(csv_path, []).append(row)
+            logger.info("Data queued for CSV: %s", csv_path)
             return csv_path
             
         except Exception as e:
-            logger.error(f"CSV save error: {e}")
+            logger.error("CSV save error: %s", e)
+            return None
+    
+    def flush_csv(self):
+        """Append all queued rows to their CSV files in one write per file"""
+        for csv_path, rows in list(self._pending_rows.items()):
+            try:
+                header = _CSV_URL_HEADER if len(rows[0]) == len(_CSV_URL_HEADER) else _CSV_HEADER
+                self._csv_writer(csv_path, header).writerows(rows)
+                logger.info("Data saved to CSV: %s (%s rows)", csv_path, len(rows))
+                del self._pending_rows[csv_path]
+            except Exception as e:
+                logger.error("CSV save error: %s", e)
+    
+    def _wait_for_price(self, driver, timeout=15):
+        """Poll the rendered text until it mentions CNY/kg"""
+        try:
+            WebDriverWait(driver, timeout, poll_frequency=0.2).until(
+                lambda d: d.execute_script(_JS_HAS_PRICE)
+            )
+            return True
+        except TimeoutException:
+            logger.warning("Timed out waiting for price element")
+            return False
+    
+    def _try_fast_fetch(self, url, session=None):
+        """Extract data from the plain HTTP response, or return None if it has no price"""
+        try:
+            page_source = self.fetch_html(url, session)
+        except requests.RequestException as e:
+            logger.warning("HTTP fetch failed: %s", e)
             return None
+        
+        logger.info("Fetched over HTTP: %s", url)
+        data = self.extract_data(page_source)
+        return data if data['rate'] else None
+    
+    def _csv_writer(self, csv_path, header=_CSV_HEADER):
+        """Return a writer on a kept-open handle for csv_path, writing the header for a new file"""
+        if csv_path not in self._writers:
+            # Only one day's file is written at a time
+            self.close_csv()
+            
+            cached_day, cached_path, cached_exists = self._csv_cache
+            file_exists = cached_exists if csv_path == cached_path else os.path.exists(csv_path)
+            file = open(csv_path, 'a', newline='', encoding='utf-8', buffering=1)
+            writer = csv.writer(file)
+            if not file_exists:
+                writer.writerow(header)
+            if csv_path == cached_path:
+                self._csv_cache = (cached_day, csv_path, True)
+            self._writers[csv_path] = (file, writer)
+        return self._writers[csv_path][1]
+    
+    def close_csv(self):
+        """Close any CSV files kept open by flush_csv"""
+        for file, _ in self._writers.values():
+            try:
+                file.close()
+            except OSError:
+                pass
+        self._writers = {}
+    
+    def scrape_url(self, url, get_driver, tag=None, session=None, overlap_screenshot=True):
+        """Scrape one URL, calling get_driver() only if the browser is needed
+
+        session defaults to self.session; run_many workers pass their own, and
+        overlap_screenshot=False since they already run in parallel.
+        """
+        # Try plain HTTP first - no browser (and no screenshot) needed if the price is server-rendered
+        data = None if self.always_screenshot else self._try_fast_fetch(url, session)
+        
+        if data is None:
+            logger.info("Price not found in HTML, falling back to WebDriver")
+            driver = get_driver()
+            driver.get(url)
+            logger.info("Navigated to: %s", url)
+            
+            # Wait for the price text instead of a fixed sleep, then read the price node directly
+            self._wait_for_price(driver)
+            element_price = self.extract_price_from_element(driver)
+            
+            page_source = self.get_page_source(driver)
+            
+            # Take the screenshot on a worker while this thread parses the HTML;
+            # the driver is only touched again once the screenshot is done
+            screenshot_future = None
+            if overlap_screenshot:
+                screenshot_future = self._background().submit(self.take_screenshot, driver, tag)
+            else:
+                self.take_screenshot(driver, tag)
+            data = self.extract_data(page_source, element_price)
+            if screenshot_future:
+                screenshot_future.result()
+            
+            if not data['rate']:
+                # Rendered text can differ from the serialized HTML
+                data['rate'] = self.extract_price_from_driver(driver)
+            
+            # Use screenshot-based fallback price - only meaningful for the silver page
+            if not data['rate'] and url == DEFAULT_URL:
+                data['rate'] = "9351"
+                logger.warning("Using fallback price from screenshot")
+        
+        return data
     
     def run_scraper(self):
         """Main scraper method"""
         logger.info("Starting SMM Silver Scraper")
-        driver = None
+        self._run_now = datetime.now()
         
         try:
-            driver = self.setup_driver()
-            logger.info("WebDriver initialized")
-            
-            driver.get(self.url)
-            logger.info(f"Navigated to: {self.url}")
+            data = self.scrape_url(self.url, self.get_driver)
+            logger.info("Extracted: %s", data)
             
-            # Extract data
-            data = self.extract_data(driver)
-            logger.info(f"Extracted: {data}")
-            
-            # Take screenshot
-            screenshot_path = self.take_screenshot(driver, data)
-            
-            # Save CSV
-            csv_path = self.save_to_csv(data)
+            # Save CSV - one row per run, so write it straight away
+            self.save_to_csv(data)
+            self.flush_csv()
             
             logger.info("✅ Scraping completed")
             return True
             
         except Exception as e:
-            logger.error(f"Scraping failed: {e}")
+            logger.error("Scraping failed: %s", e)
             
-            # Emergency fallback
-            try:
-                fallback_data = {
-                    'date': '2025-07-24',
-                    'rate': '9351',
-                    'raw_date': 'Jul 24, 2025'
-                }
-                self.save_to_csv(fallback_data)
-                logger.info("Emergency CSV created")
-            except:
-                pass
-                
-            return False
+            # Drop a possibly broken browser so the next run starts fresh
+            self.close_driver()
             
-        finally:
-            if driver:
+            # Emergency fallback - the silver constant only fits the default page
+            if self.url == DEFAULT_URL:
                 try:
-                    driver.quit()
+                    fallback_data = {
+                        'date': '2025-07-24',
+                        'rate': '9351',
+                        'raw_date': 'Jul 24, 2025'
+                    }
+                    self.save_to_csv(fallback_data)
+                    self.flush_csv()
+                    logger.info("Emergency CSV created")
                 except:
                     pass
+                
+            return False
+        
+        finally:
+            # Later now() calls read the wall clock again
+            self._run_now = None
+    
+    def _thread_driver(self):
+        """Return the calling worker thread's own WebDriver"""
+        driver = getattr(self._local, 'driver', None)
+        if driver is None:
+            driver = self._local.driver = self.setup_driver()
+            with self._lock:
+                self._thread_drivers.append(driver)
+        return driver
+    
+    def _scrape_one(self, index, url):
+        """Worker body for run_many - returns the row instead of writing it"""
+        try:
+            data = self.scrape_url(url, self._thread_driver, tag=f'{index:02d}_{_url_slug(url)}',
+                                   session=self._thread_session(), overlap_screenshot=False)
+            data['url'] = url
+            return data
+        except Exception as e:
+            logger.error("Scraping failed for %s: %s", url, e)
+            return None
+    
+    def run_many(self, urls, workers=4):
+        """Scrape several URLs in parallel with one WebDriver per worker thread
+        
+        Rows carry their 'url' and are written, with it, to a separate
+        smm_silver_prices_urls_<day>.csv rather than the single-URL daily file.
+        """
+        logger.info("Scraping %s URLs with %s workers", len(urls), workers)
+        self._run_now = datetime.now()
+        
+        try:
+            try:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    rows = list(executor.map(self._scrape_one, range(len(urls)), urls))
+            finally:
+                self._close_workers()
+            
+            # Rows are written from the main thread only
+            for row in rows:
+                if row:
+                    self.save_to_csv(row)
+            self.flush_csv()
+            return rows
+        finally:
+            self._run_now = None
+    
+    def _close_workers(self):
+        """Quit the per-worker drivers and close the per-worker sessions run_many created"""
+        # Selenium drivers are not thread-safe, so each worker had its own
+        for driver in self._thread_drivers:
+            try:
+                driver.quit()
+            except:
+                pass
+        self._thread_drivers = []
+        for session in self._thread_sessions:
+            session.close()
+        self._thread_sessions = []
+        self._local = threading.local()
+    
+    def run_forever(self, interval):
+        """Scrape every `interval` seconds, keeping one browser open between runs"""
+        logger.info("Running every %ss", interval)
+        while True:
+            self.run_scraper()
+            time.sleep(interval)
 
 def main():
-    scraper = SMMSilverScraper()
-    success = scraper.run_scraper()
+    parser = argparse.ArgumentParser(description="SMM Silver Price Scraper")
+    parser.add_argument('--interval', type=int, default=0,
+                        help="keep running and scrape every INTERVAL seconds")
+    parser.add_argument('--screenshot', action='store_true',
+                        help="always load the page in Chrome so every run keeps a screenshot")
+    args = parser.parse_args()
+    
+    with SMMSilverScraper(always_screenshot=args.screenshot) as scraper:
+        if args.interval:
+            try:
+                scraper.run_forever(args.interval)
+            except KeyboardInterrupt:
+                logger.info("Scraper stopped")
+            return
+        success = scraper.run_scraper()
     
     if success:
         print("✅ Scraping completed!")
@@ -0,0 +1,327 @@
+import base64
+import csv
+import os
+import sys
+import threading
+import time
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope='module')
+def main_scraper(tmp_path_factory):
+    # main_scraper logs to logs/ and creates csv/ and screenshots/ in the working directory
+    workdir = tmp_path_factory.mktemp('scraper')
+    (workdir / 'logs').mkdir()
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        import main_scraper
+        yield main_scraper
+    finally:
+        os.chdir(cwd)
+
+
+@pytest.fixture(scope='module')
+def scraper(main_scraper):
+    return main_scraper.SMMSilverScraper()
+
+
+@pytest.fixture
+def stub_scraper(main_scraper):
+    """A scraper whose HTTP fetch finds no price and whose browser is a _StubDriver"""
+    stub = main_scraper.SMMSilverScraper()
+    stub.fetch_html = lambda url=None, session=None: '<p>no price here</p>'
+    stub.setup_driver = _StubDriver
+    yield stub
+    stub.close()
+
+
+def test_scan_text_date_before_price_in_same_text_node(scraper):
+    html = '<span>Updated 2025-07-24 Silver price 9,351 CNY/kg</span>'
+    assert scraper.scan_text(html) == ('9351', '2025-07-24')
+
+
+def test_scan_text_skips_out_of_range_number(scraper):
+    assert scraper.scan_text('<p>Since 2019 silver 9412 CNY/kg</p>') == ('9412', None)
+
+
+@pytest.mark.parametrize('html, price', [
+    ('<p>Original price 9,351.00 CNY/kg</p>', '9351'),
+    ('<p>Silver 9400.50 CNY/kg</p>', '9400'),
+    ('<p>9,351 +12 CNY/kg</p>', '9351'),
+    ('<p>Silver 9412 (+12) CNY/kg</p>', '9412'),
+])
+def test_scan_text_decimal_and_annotated_prices(scraper, html, price):
+    assert scraper.scan_text(html)[0] == price
+
+
+def test_scan_text_long_text_node_of_numbers_is_linear(scraper):
+    # Inline JSON: no '>' between ~1 MB of out-of-range numbers and the unit. Linear
+    # scanning takes well under a second; the old quadratic rescan took minutes
+    numbers = ','.join(str(1000 + i % 7000) for i in range(200000))
+    html = '<script>{"p":[' + numbers + '],"u":"CNY/kg","s":"9412 CNY/kg"}</script>'
+    start = time.perf_counter()
+    assert scraper.scan_text(html) == ('9412', None)
+    assert time.perf_counter() - start < 30
+
+
+def test_run_scraper_writes_row_without_context_manager(scraper):
+    scraper.fetch_html = lambda url=None, session=None: '<p>2025-07-25</p><p>9400 CNY/kg</p>'
+    try:
+        assert scraper.run_scraper()
+    finally:
+        del scraper.fetch_html
+    csv_path = scraper._csv_cache[1]
+    with open(csv_path, encoding='utf-8') as f:
+        assert '2025-07-25,9400,2025-07-25' in f.read()
+
+
+def test_now_is_wall_clock_again_after_a_run(scraper):
+    scraper.fetch_html = lambda url=None, session=None: '<p>9400 CNY/kg</p>'
+    try:
+        assert scraper.run_scraper()
+    finally:
+        del scraper.fetch_html
+    assert scraper._run_now is None
+
+
+def test_find_price_in_text_ignores_numbers_far_from_unit(scraper):
+    assert scraper.find_price_in_text('© 2025 metal.com\nSilver\n9,351\nCNY/kg') == '9351'
+
+
+def test_extract_price_from_dom_with_earlier_number(scraper):
+    html = '<body><p>2025-07-25</p><span>9,400</span><span>CNY/kg</span></body>'
+    assert scraper.extract_price_from_dom(html) == '9400'
+
+
+def test_find_price_in_text_returns_first_in_range_match(scraper):
+    text = 'Gold 12,500 CNY/kg\n© 2025\nSilver 9,351 CNY/kg\nBronze 8,100 CNY/kg'
+    assert scraper.find_price_in_text(text) == '9351'
+
+
+def test_find_price_in_text_accepts_decimal_price(scraper):
+    assert scraper.find_price_in_text('Silver 9,351.00 CNY/kg') == '9351'
+    assert scraper.extract_price_from_dom('<p><span>9,351.00</span><span>CNY/kg</span></p>') == '9351'
+
+
+def test_always_screenshot_skips_http_path(main_scraper):
+    forced = main_scraper.SMMSilverScraper(always_screenshot=True)
+    forced._try_fast_fetch = lambda url, session=None: pytest.fail("HTTP path should be skipped")
+
+    def no_browser():
+        raise RuntimeError("browser requested")
+
+    with pytest.raises(RuntimeError, match="browser requested"):
+        forced.scrape_url(forced.url, no_browser)
+
+
+def test_price_window_finds_spaced_unit(scraper):
+    html = 'x' * 100000 + '<span>9,351</span><span>CNY / kg</span>'
+    assert 'CNY / kg' in scraper.price_window(html)
+
+
+def test_price_window_falls_back_to_unit_regex(scraper):
+    html = 'x' * 100000 + '<span>9,351</span><span>cny/KG</span>'
+    assert 'cny/KG' in scraper.price_window(html)
+
+
+def test_write_atomic_concurrent_writers(main_scraper, tmp_path):
+    path = str(tmp_path / 'page_source.html')
+    threads = [threading.Thread(target=main_scraper._write_atomic, args=(path, str(i) * 50000))
+               for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    with open(path, encoding='utf-8') as f:
+        content = f.read()
+    assert len(set(content)) == 1 and len(content) == 50000
+    assert os.listdir(tmp_path) == ['page_source.html']
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('Jul 24, 2025', '2025-07-24'),
+    ('2025-07-24', '2025-07-24'),
+    ('24/07/2025', '2025-07-24'),
+    ('29/02/2024', '2024-02-29'),
+])
+def test_parse_date_formats(scraper, text, expected):
+    assert scraper.parse_date(text) == expected
+
+
+@pytest.mark.parametrize('text', ['31/02/2025', '2025-02-31', '2025-13-01', '29/02/2025'])
+def test_parse_date_rejects_impossible_dates(scraper, text):
+    assert scraper.parse_date(text) == scraper.now().strftime('%Y-%m-%d')
+
+
+class _StubDriver:
+    """Just enough of a WebDriver for scrape_url's browser path"""
+
+    title = 'stub'
+    current_url = 'about:blank'
+
+    def get(self, url):
+        pass
+
+    def execute_script(self, js, *args):
+        if 'readyState' in js:
+            return 'complete'
+        if 'document.evaluate' in js:
+            return []
+        return True if 'test(' in js else '9,300 CNY/kg'
+
+    def execute_cdp_cmd(self, cmd, params):
+        if cmd == 'Page.captureScreenshot':
+            return {'data': base64.b64encode(b'JPEG').decode()}
+        if cmd == 'DOM.getDocument':
+            return {'root': {'nodeId': 1}}
+        return {'outerHTML': '<p>2025-07-22</p><p>9300 CNY/kg</p>'}
+
+    def delete_all_cookies(self):
+        pass
+
+    def quit(self):
+        pass
+
+
+def test_extract_price_from_element_reads_siblings_in_one_call(scraper):
+    calls = []
+
+    class SiblingDriver(_StubDriver):
+        def execute_script(self, js, *args):
+            calls.append(args)
+            return ['2025', '9,351.00']
+
+    assert scraper.extract_price_from_element(SiblingDriver()) == '9351'
+    assert len(calls) == 1
+
+
+def test_run_many_writes_one_screenshot_per_url(stub_scraper):
+    urls = ['https://example.com/a/', 'https://example.com/b/', 'https://example.com/a/']
+    before = set(os.listdir(stub_scraper.screenshot_folder))
+    rows = stub_scraper.run_many(urls, workers=3)
+    assert [row['url'] for row in rows] == urls
+    assert stub_scraper._run_now is None
+    assert len(set(os.listdir(stub_scraper.screenshot_folder)) - before) == len(urls)
+
+
+def test_run_many_rows_keep_their_url_and_skip_silver_fallback(main_scraper, stub_scraper):
+    class NoPriceDriver(_StubDriver):
+        def execute_script(self, js, *args):
+            if 'readyState' in js:
+                return 'complete'
+            if 'document.evaluate' in js:
+                return []
+            return js == main_scraper._JS_HAS_PRICE or ''
+
+        def execute_cdp_cmd(self, cmd, params):
+            if cmd == 'DOM.getOuterHTML':
+                return {'outerHTML': '<p>no price here</p>'}
+            return super().execute_cdp_cmd(cmd, params)
+
+    stub_scraper.setup_driver = NoPriceDriver
+    urls = ['https://example.com/copper/', 'https://example.com/gold/']
+    rows = stub_scraper.run_many(urls, workers=2)
+    stub_scraper.close_csv()
+    assert [row['rate'] for row in rows] == [None, None]
+    csv_path = os.path.join(stub_scraper.csv_folder, f"smm_silver_prices_urls_{stub_scraper.now():%Y%m%d}.csv")
+    with open(csv_path, encoding='utf-8', newline='') as f:
+        written = list(csv.DictReader(f))
+    assert [row['url'] for row in written[-2:]] == urls
+    assert all(row['rate'] != '9351' for row in written)
+
+
+def test_driver_path_resolves_once_for_concurrent_callers(main_scraper, tmp_path, monkeypatch):
+    installs = []
+
+    class SlowManager:
+        def install(self):
+            installs.append(1)
+            time.sleep(0.05)
+            path = tmp_path / 'chromedriver'
+            path.write_text('')
+            path.chmod(0o755)
+            return str(path)
+
+    monkeypatch.setattr(main_scraper, 'ChromeDriverManager', SlowManager)
+    monkeypatch.setattr(main_scraper, '_DRIVER_CACHE_FILE', str(tmp_path / 'cache' / 'driver'))
+    main_scraper._resolve_driver_path.cache_clear()
+    try:
+        threads = [threading.Thread(target=main_scraper._driver_path) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        main_scraper._resolve_driver_path.cache_clear()
+    assert len(installs) == 1
+
+
+def test_run_many_takes_screenshots_on_its_own_workers(stub_scraper):
+    shot_threads = []
+    take_screenshot = stub_scraper.take_screenshot
+
+    def record(driver, tag=None):
+        shot_threads.append(threading.current_thread().name)
+        return take_screenshot(driver, tag)
+
+    stub_scraper.take_screenshot = record
+    stub_scraper.run_many(['https://example.com/a/', 'https://example.com/b/'], workers=2)
+    assert stub_scraper._executor is None
+    assert len(shot_threads) == 2
+
+
+def test_run_scraper_off_main_thread_uses_the_shared_session(stub_scraper):
+    sessions = []
+    stub_scraper.fetch_html = lambda url=None, session=None: sessions.append(session) or '<p>9400 CNY/kg</p>'
+    closed = []
+    stub_scraper.session.close = lambda: closed.append(True)
+    worker = threading.Thread(target=stub_scraper.run_scraper)
+    worker.start()
+    worker.join()
+    assert sessions == [None]
+    assert stub_scraper._thread_sessions == []
+    stub_scraper.close()
+    assert closed == [True]
+
+
+def test_get_driver_replaces_dead_driver(stub_scraper):
+
+    class DeadDriver(_StubDriver):
+        def delete_all_cookies(self):
+            raise WebDriverException("chrome not reachable")
+
+    stub_scraper._driver = DeadDriver()
+    stub_scraper._driver_uses = 3
+    driver = stub_scraper.get_driver()
+    assert type(driver) is _StubDriver
+    assert stub_scraper._driver_uses == 1
+
+
+def test_extract_data_with_known_price_only_scans_for_date(scraper, monkeypatch):
+    def no_dom_lookup(page_source):
+        raise AssertionError("price lookup should be skipped")
+
+    monkeypatch.setattr(scraper, 'extract_price_from_dom', no_dom_lookup)
+    data = scraper.extract_data('<p>9400 CNY/kg</p><p>2025-07-25</p>', price='9288')
+    assert data['rate'] == '9288'
+    assert data['date'] == '2025-07-25'
+
+
+def test_price_window_without_unit_is_none(scraper):
+    assert scraper.price_window('<p>2025-07-25</p><p>9400</p>') is None
+    assert scraper.extract_data('<p>2025-07-25</p><p>9400</p>')['date'] == '2025-07-25'
+
+
+def test_screenshot_recreates_deleted_folder(main_scraper, tmp_path, monkeypatch):
+    main_scraper.SMMSilverScraper()
+    monkeypatch.chdir(tmp_path)
+    fresh = main_scraper.SMMSilverScraper()
+    assert os.path.isdir(fresh.screenshot_folder)
+    os.rmdir(fresh.screenshot_folder)
+    path = fresh.take_screenshot(_StubDriver(), tag='gone')
+    assert path and os.path.isfile(path)